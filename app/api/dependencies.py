@@ -1,5 +1,7 @@
 """Dependency injection for FastAPI routes."""
-from fastapi import Depends
+from arq import ArqRedis
+from fastapi import Depends, Request
+from langchain_openai import ChatOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.repositories.vector_store import VectorStoreRepository
@@ -9,43 +11,73 @@ from app.services.document_service import DocumentService
 from app.services.chat_service import ChatService
 
 
-# Singleton instances
-_vector_repo = None
+def get_vector_repo(request: Request) -> VectorStoreRepository:
+    """Get the vector repository singleton (created at startup)."""
+    return request.app.state.vector_repo
 
 
-def get_vector_repo() -> VectorStoreRepository:
-    """Get or create vector repository singleton."""
-    global _vector_repo
-    if _vector_repo is None:
-        _vector_repo = VectorStoreRepository()
-    return _vector_repo
+def get_llm(request: Request) -> ChatOpenAI:
+    """Get the chat model singleton (created at startup)."""
+    return request.app.state.llm
 
 
-async def get_document_service(db: AsyncSession = Depends(get_db)) -> DocumentService:
+def get_task_queue(request: Request) -> ArqRedis:
+    """Get the ARQ pool (created at startup) used to enqueue ingestion jobs."""
+    return request.app.state.task_queue
+
+
+async def get_document_service(
+    db: AsyncSession = Depends(get_db),
+    vector_repo: VectorStoreRepository = Depends(get_vector_repo)
+) -> DocumentService:
     """
     Get document service with dependencies.
     
     Args:
         db: Database session from dependency
+        vector_repo: Shared vector repository
         
     Returns:
         DocumentService instance
     """
-    vector_repo = get_vector_repo()
     doc_repo = DocumentRepository(db)
     return DocumentService(vector_repo, doc_repo)
 
 
-async def get_chat_service(db: AsyncSession = Depends(get_db)) -> ChatService:
+async def get_chat_service(
+    db: AsyncSession = Depends(get_db),
+    vector_repo: VectorStoreRepository = Depends(get_vector_repo),
+    llm: ChatOpenAI = Depends(get_llm)
+) -> ChatService:
     """
     Get chat service with dependencies.
     
     Args:
         db: Database session from dependency
+        vector_repo: Shared vector repository
+        llm: Shared chat model
+        
+    Returns:
+        ChatService instance
+    """
+    return build_chat_service(db, vector_repo, llm)
+
+
+def build_chat_service(
+    db: AsyncSession,
+    vector_repo: VectorStoreRepository,
+    llm: ChatOpenAI
+) -> ChatService:
+    """
+    Build a chat service bound to the given database session.
+    
+    Args:
+        db: Database session the service should use
+        vector_repo: Shared vector repository
+        llm: Shared chat model
         
     Returns:
         ChatService instance
     """
-    vector_repo = get_vector_repo()
     chat_repo = ChatRepository(db)
-    return ChatService(chat_repo, vector_repo)
+    return ChatService(chat_repo, vector_repo, llm)
@@ -1,4 +1,4 @@
 """API routes package."""
-from app.api.routes import session, upload, chat
+from app.api.routes import session, upload, document, chat
 
-__all__ = ["session", "upload", "chat"]
+__all__ = ["session", "upload", "document", "chat"]
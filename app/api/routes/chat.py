@@ -1,9 +1,13 @@
 """Chat routes."""
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from langchain_openai import ChatOpenAI
 from uuid import UUID
+from app.database import session_scope
+from app.repositories.vector_store import VectorStoreRepository
 from app.services.chat_service import ChatService
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.api.dependencies import get_chat_service
+from app.api.dependencies import get_chat_service, get_vector_repo, get_llm, build_chat_service
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -49,3 +53,40 @@ async def chat(
             status_code=500,
             detail=f"Chat generation failed: {str(e)}"
         )
+
+
+@router.post("/{session_id}/stream")
+async def chat_stream(
+    session_id: UUID,
+    request: ChatRequest,
+    vector_repo: VectorStoreRepository = Depends(get_vector_repo),
+    llm: ChatOpenAI = Depends(get_llm)
+):
+    """
+    Send a message and stream the AI response as Server-Sent Events.
+    
+    Same RAG flow as POST /chat/{session_id}, but tokens are sent as
+    `data:` events while they are generated, followed by an
+    `event: done` message.
+    
+    Args:
+        session_id: Session UUID
+        request: Chat request with user message
+        vector_repo: Shared vector repository
+        llm: Shared chat model
+        
+    Returns:
+        StreamingResponse with media type text/event-stream
+    """
+    async def event_stream():
+        # The stream outlives request-scoped dependencies, so it owns its
+        # DB session (committed once the full response has been saved)
+        async with session_scope() as db:
+            chat_service = build_chat_service(db, vector_repo, llm)
+            async for event in chat_service.stream_response(
+                session_id=session_id,
+                user_message=request.message
+            ):
+                yield event
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
@@ -0,0 +1,42 @@
+"""Document status routes."""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+from app.database import get_db
+from app.repositories.document_repository import DocumentRepository
+from app.schemas.document import DocumentStatusResponse
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+@router.get("/{document_id}", response_model=DocumentStatusResponse)
+async def get_document_status(
+    document_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get the processing status of an uploaded document.
+    
+    Status moves from 'pending' to 'indexed' (or 'failed') once the
+    ingestion worker has handled it.
+    
+    Args:
+        document_id: Document UUID returned by the upload endpoint
+        
+    Returns:
+        DocumentStatusResponse with the current status
+        
+    Raises:
+        HTTPException: If the document doesn't exist
+    """
+    document = await DocumentRepository(db).get_document(document_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+        
+    return DocumentStatusResponse(
+        document_id=document.id,
+        session_id=document.session_id,
+        filename=document.filename,
+        status=document.status,
+        created_at=document.created_at
+    )
@@ -1,65 +1,235 @@
 """Document upload routes."""
-from fastapi import APIRouter, UploadFile, File, Depends, BackgroundTasks, HTTPException
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import aiofiles
+from arq import ArqRedis
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from app.config import settings
+from app.database import get_db
 from app.services.document_service import DocumentService
-from app.schemas.document import DocumentResponse
-from app.api.dependencies import get_document_service
+from app.schemas.document import DocumentResponse, DocumentBatchResponse
+from app.api.dependencies import get_document_service, get_task_queue
 
 router = APIRouter(prefix="/upload", tags=["documents"])
 
+ALLOWED_TYPES = ["application/pdf", "text/plain"]
+
+# Spool writes get their own threads instead of competing with the default
+# executor (which Starlette also uses for reading uploads)
+_spool_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="spool")
+
+
+def _validate_type(file: UploadFile) -> None:
+    """
+    Reject files the ingestion pipeline can't parse.
+    
+    Raises:
+        HTTPException: If file type is unsupported
+    """
+    if file.content_type not in ALLOWED_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file.content_type}. Allowed: {ALLOWED_TYPES}"
+        )
+
+
+async def _spool_to_disk(file: UploadFile) -> str:
+    """
+    Copy an upload to a file in UPLOAD_DIR in fixed-size chunks.
+    
+    Args:
+        file: Uploaded file
+        
+    Returns:
+        Path of the spooled file (deleted by the worker once ingested)
+        
+    Raises:
+        HTTPException: If the file is larger than MAX_UPLOAD_BYTES
+    """
+    suffix = os.path.splitext(file.filename or "")[1]
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=settings.UPLOAD_DIR)
+    os.close(fd)
+    
+    try:
+        # Writes run on the spool threads, keeping the event loop free
+        async with aiofiles.open(path, "wb", executor=_spool_executor) as temp_file:
+            size = 0
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.MAX_UPLOAD_BYTES:
+                    # The middleware caps the whole request; this caps one file
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Upload exceeds {settings.MAX_UPLOAD_BYTES} bytes"
+                    )
+                await temp_file.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+async def _accept(
+    files: List[UploadFile],
+    session_id: UUID,
+    doc_service: DocumentService,
+    task_queue: ArqRedis,
+    db: AsyncSession
+) -> List[UUID]:
+    """
+    Spool uploads to disk, register them, and queue one ingest job per file.
+    The worker runs up to MAX_CONCURRENT_UPLOADS of those jobs at once.
+    
+    Args:
+        files: Uploaded files (already type-checked)
+        session_id: Session UUID
+        doc_service: Document service
+        task_queue: Ingestion job queue
+        db: Database session (shared with doc_service)
+        
+    Returns:
+        Document UUIDs, in the order of files
+    """
+    # Stream to disk instead of holding the whole file in memory
+    file_paths = []
+    try:
+        for file in files:
+            file_paths.append(await _spool_to_disk(file))
+    except BaseException:
+        for path in file_paths:
+            os.unlink(path)
+        raise
+    
+    document_ids = []
+    try:
+        for file, file_path in zip(files, file_paths):
+            document_ids.append(await doc_service.create_document(
+                session_id=session_id,
+                filename=file.filename,
+                mime_type=file.content_type,
+                file_size=os.path.getsize(file_path)
+            ))
+        # The worker must be able to see the records before the jobs run
+        await db.commit()
+    except BaseException:
+        for path in file_paths:
+            os.unlink(path)
+        raise
+    
+    # Schedule processing in the ingestion worker
+    results = await asyncio.gather(*[
+        task_queue.enqueue_job(
+            "ingest_document",
+            file_path=file_path,
+            document_id=document_id,
+            filename=file.filename,
+            session_id=session_id,
+            mime_type=file.content_type
+        )
+        for file, file_path, document_id in zip(files, file_paths, document_ids)
+    ], return_exceptions=True)
+    
+    # Files whose job was queued belong to the worker now
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for file_path, result in zip(file_paths, results):
+        if isinstance(result, BaseException):
+            os.unlink(file_path)
+    if errors:
+        raise errors[0]
+    return document_ids
+
 
 @router.post("/{session_id}", response_model=DocumentResponse, status_code=202)
 async def upload_document(
     session_id: UUID,
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
-    doc_service: DocumentService = Depends(get_document_service)
+    doc_service: DocumentService = Depends(get_document_service),
+    task_queue: ArqRedis = Depends(get_task_queue),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Upload a document for RAG context.
     
-    The document will be processed asynchronously:
+    The document will be processed asynchronously by the ingestion worker:
     1. Parsed (PDF/TXT)
     2. Chunked into sections
     3. Embedded with OpenAI
     4. Stored in pgvector with session metadata
     
+    Poll GET /documents/{document_id} to see when it has been indexed.
+    
     Supported formats: PDF, TXT
     
     Args:
         session_id: Session UUID
         file: Uploaded file
-        background_tasks: FastAPI background tasks
         doc_service: Document service dependency
+        task_queue: Ingestion job queue
+        db: Database session (shared with doc_service)
         
     Returns:
         DocumentResponse indicating upload accepted
         
     Raises:
-        HTTPException: If file type is unsupported
+        HTTPException: If file type is unsupported or the file is too large
     """
-    # Validate file type
-    allowed_types = ["application/pdf", "text/plain"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type: {file.content_type}. Allowed: {allowed_types}"
-        )
+    _validate_type(file)
     
-    # Read file content
-    content = await file.read()
+    document_ids = await _accept([file], session_id, doc_service, task_queue, db)
     
-    # Schedule background processing
-    background_tasks.add_task(
-        doc_service.ingest_document,
-        file_content=content,
+    return DocumentResponse(
+        message="Document upload accepted. Processing in background.",
         filename=file.filename,
         session_id=session_id,
-        mime_type=file.content_type
+        document_id=document_ids[0]
     )
+
+
+@router.post("/{session_id}/batch", response_model=DocumentBatchResponse, status_code=202)
+async def upload_documents(
+    session_id: UUID,
+    files: List[UploadFile] = File(...),
+    doc_service: DocumentService = Depends(get_document_service),
+    task_queue: ArqRedis = Depends(get_task_queue),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Upload several documents at once. Each file gets its own ingest job,
+    so the worker processes them concurrently instead of one after another.
     
-    return DocumentResponse(
-        message="Document upload accepted. Processing in background.",
-        filename=file.filename,
-        session_id=session_id
+    Each file may be up to MAX_UPLOAD_BYTES, the request as a whole up to
+    MAX_BATCH_UPLOAD_BYTES.
+    
+    Supported formats: PDF, TXT
+    
+    Args:
+        session_id: Session UUID
+        files: Uploaded files
+        doc_service: Document service dependency
+        task_queue: Ingestion job queue
+        db: Database session (shared with doc_service)
+        
+    Returns:
+        DocumentBatchResponse with one document id per file
+        
+    Raises:
+        HTTPException: If any file type is unsupported, or a file or the
+            whole request is too large
+    """
+    # Check every file before spooling any of them
+    for file in files:
+        _validate_type(file)
+    
+    document_ids = await _accept(files, session_id, doc_service, task_queue, db)
+    
+    return DocumentBatchResponse(
+        message=f"{len(files)} document uploads accepted. Processing in background.",
+        session_id=session_id,
+        filenames=[file.filename for file in files],
+        document_ids=document_ids
     )
@@ -1,4 +1,6 @@
 """Configuration management using pydantic-settings."""
+import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -7,27 +9,61 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # One pool per process: (UVICORN_WORKERS + 1 arq worker) x (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # must stay below Postgres max_connections (100 by default)
+    DB_POOL_SIZE: int = 5  # Connections kept open (and pre-warmed on startup)
+    DB_MAX_OVERFLOW: int = 10  # Extra connections allowed under burst load
+    DB_POOL_PRE_PING: bool = False  # Extra round-trip per checkout; pool_recycle retires idle connections
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
     
     # LLM Provider
     LLM_PROVIDER: str = "openai"
     LLM_MODEL: str = "gpt-3.5-turbo"
     OPENAI_API_KEY: str = ""
+    OPENAI_MAX_CONNECTIONS: int = 100  # Pooled keep-alive connections to the OpenAI API
     
     # Embeddings
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSION: int = 1536
+    EMBEDDING_BATCH_SIZE: int = 256  # Chunks per embeddings API call (OpenAI max: 2048)
+    EMBEDDING_CONCURRENCY: int = 4  # Max in-flight embedding batches per ingest
+    COPY_FLUSH_ROWS: int = 2048  # Embedded chunks buffered per COPY during ingest
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024  # Cached query embeddings (0 disables)
     
     # Chunking
-    CHUNK_SIZE: int = 1000
-    CHUNK_OVERLAP: int = 200
+    CHUNK_SIZE: int = 1500  # Fewer, larger chunks: fewer embedding inputs and index rows
+    CHUNK_OVERLAP: int = 150  # ~10% of CHUNK_SIZE
+    MIN_CHUNK_SIZE: int = 100  # Shorter chunks are merged into a neighbour
+    TEXT_SPLITTER: str = "semantic"  # "semantic" (Rust) or "langchain"
     
     # Vector Search
     VECTOR_INDEX_TYPE: str = "hnsw"
     SIMILARITY_METRIC: str = "cosine"
+    HNSW_M: int = 16  # Max graph connections per node
+    HNSW_EF_CONSTRUCTION: int = 100  # Build-time candidate list size
+    HNSW_EF_SEARCH: int = 40  # Minimum query-time candidate list size
+    VECTOR_PRECISION: str = "halfvec"  # Index representation: "halfvec", "bit" or "vector"
+    VECTOR_RERANK_FACTOR: int = 4  # Index candidates per result, reranked in FP32 (raise for "bit")
+    SEARCH_BATCH_WINDOW_MS: float = 5  # Time concurrent searches wait to share a batch
+    SEARCH_BATCH_MAX_SIZE: int = 32  # Max searches coalesced into one query
+    
+    # Uploads / ingestion worker
+    REDIS_URL: str = "redis://localhost:6379"
+    # Must be shared with the worker; tmpfs when available (None = system temp dir)
+    UPLOAD_DIR: Optional[str] = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes copied per read when spooling uploads
+    MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024  # Per file (and per single-file request); larger gets 413
+    MAX_BATCH_UPLOAD_BYTES: int = 200 * 1024 * 1024  # Whole /upload/{id}/batch request body
+    MAX_CONCURRENT_UPLOADS: int = 4  # Ingest jobs a worker runs at once
+    INGEST_JOB_TIMEOUT: int = 600  # Seconds before an ingest job is aborted
     
     # Application
     APP_HOST: str = "0.0.0.0"
     APP_PORT: int = 8000
+    # Fixed rather than per CPU (os.cpu_count() sees the host's CPUs inside a
+    # container): each worker has its own DB pool, see DB_POOL_SIZE above
+    UVICORN_WORKERS: int = 4
+    UVICORN_RELOAD: bool = False  # Development only (forces a single worker)
     
     class Config:
         env_file = ".env"
@@ -1,15 +1,33 @@
 """Database setup with async SQLAlchemy."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,  # Set to True for SQL debugging
-    future=True
+    future=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record):
+    """Exchange vector values in pgvector's binary format (raw float32s)."""
+    dbapi_connection.run_async(register_vector)
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -21,8 +39,27 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
-async def get_db():
-    """Dependency to get database session."""
+async def warm_up_pool() -> None:
+    """
+    Open DB_POOL_SIZE connections at once so the first requests don't pay
+    TCP + auth setup. Connections go back to the pool when closed.
+    """
+    results = await asyncio.gather(
+        *[engine.connect() for _ in range(settings.DB_POOL_SIZE)],
+        return_exceptions=True
+    )
+    connections = [r for r in results if not isinstance(r, BaseException)]
+    await asyncio.gather(*[conn.close() for conn in connections])
+    
+    logger.info(f"Pre-warmed {len(connections)}/{settings.DB_POOL_SIZE} database connections")
+
+
+@asynccontextmanager
+async def session_scope():
+    """
+    Transactional session for work that outlives a request's dependencies
+    (e.g. streaming responses). Commits on success, rolls back on error.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
@@ -32,3 +69,9 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+
+async def get_db():
+    """Dependency to get database session."""
+    async with session_scope() as session:
+        yield session
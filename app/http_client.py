@@ -0,0 +1,23 @@
+"""Shared HTTP client for OpenAI API calls."""
+import httpx
+from app.config import settings
+
+
+def create_openai_http_client() -> httpx.AsyncClient:
+    """
+    Create the async HTTP client shared by the chat and embeddings clients.
+    
+    One pooled client per process keeps TLS connections alive across
+    requests, and HTTP/2 lets concurrent chat and embedding calls share a
+    connection. Close it with aclose() on shutdown.
+    
+    Returns:
+        httpx.AsyncClient instance
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS
+        )
+    )
@@ -1,8 +1,17 @@
 """FastAPI main application."""
 import logging
-from fastapi import FastAPI
+from arq import create_pool
+from arq.connections import RedisSettings
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.routes import session, upload, chat
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.api.routes import session, upload, document, chat
+from app.database import warm_up_pool
+from app.http_client import create_openai_http_client
+from app.repositories.vector_store import VectorStoreRepository
+from app.services.chat_service import create_llm
 from app.config import settings
 
 # Configure logging
@@ -11,16 +20,87 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """
+    GZip that leaves SSE streams alone: compressing them would buffer
+    tokens and keep per-chunk compressor state (do that at the proxy).
+    """
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Cap upload request bodies at MAX_UPLOAD_BYTES, or MAX_BATCH_UPLOAD_BYTES
+    for the batch route (whose files the route still holds to
+    MAX_UPLOAD_BYTES each). This has to happen ahead of routing, since
+    FastAPI parses (and spools) the whole multipart body before the route
+    handler runs.
+    
+    A Content-Length over the limit is rejected before any of the body is
+    read; otherwise (chunked or understated bodies) the bytes are counted
+    as they arrive and parsing stops with a 413 once the limit is passed.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith("/upload"):
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["path"].endswith("/batch"):
+            limit = settings.MAX_BATCH_UPLOAD_BYTES
+        else:
+            limit = settings.MAX_UPLOAD_BYTES
+        detail = f"Upload exceeds {limit} bytes"
+        
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > limit:
+            response = ORJSONResponse(status_code=413, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside body parsing; FastAPI passes HTTPExceptions
+                    # through, so this becomes the 413 response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="RAG Chatbot Backend",
     description="Production-grade RAG chatbot with session isolation",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # C-based JSON encoding
 )
 
-# CORS middleware (configure as needed)
+# Fail oversized uploads fast
+app.add_middleware(UploadSizeLimitMiddleware)
+
+# Compress JSON responses (chat answers are mostly English text)
+app.add_middleware(JSONGZipMiddleware, minimum_size=512, compresslevel=5)
+
+# CORS middleware (configure as needed); added last so it is outermost
+# and its headers are on every response, including the 413s above
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure for production
@@ -32,9 +112,54 @@ app.add_middleware(
 # Register routers
 app.include_router(session.router)
 app.include_router(upload.router)
+app.include_router(document.router)
 app.include_router(chat.router)
 
 
+@app.on_event("startup")
+async def create_singletons():
+    """Build process-wide clients once instead of per request."""
+    app.state.openai_http = create_openai_http_client()
+    app.state.vector_repo = VectorStoreRepository(app.state.openai_http)
+    app.state.llm = create_llm(app.state.openai_http)
+
+
+@app.on_event("startup")
+async def prepare_vector_store():
+    """Make sure pgvector tables, columns and indexes exist before serving."""
+    await app.state.vector_repo.ensure_schema()
+
+
+@app.on_event("startup")
+async def warm_db_pool():
+    """Establish pooled DB connections before the first request arrives."""
+    await warm_up_pool()
+
+
+@app.on_event("startup")
+async def connect_task_queue():
+    """Connect to Redis for enqueueing ingestion jobs."""
+    app.state.task_queue = await create_pool(RedisSettings.from_dsn(settings.REDIS_URL))
+
+
+@app.on_event("shutdown")
+async def close_task_queue():
+    """Close the Redis connection pool."""
+    await app.state.task_queue.close()
+
+
+@app.on_event("shutdown")
+async def close_vector_store():
+    """Stop background vector search batching."""
+    await app.state.vector_repo.close()
+
+
+@app.on_event("shutdown")
+async def close_openai_http():
+    """Close pooled connections to the OpenAI API."""
+    await app.state.openai_http.aclose()
+
+
 @app.get("/health")
 async def health_check():
     """
@@ -67,5 +192,8 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.APP_HOST,
         port=settings.APP_PORT,
-        reload=True
+        loop="uvloop",  # libuv event loop
+        http="httptools",  # C HTTP parser
+        workers=settings.UVICORN_WORKERS,
+        reload=settings.UVICORN_RELOAD
     )
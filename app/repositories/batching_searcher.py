@@ -0,0 +1,147 @@
+"""Micro-batching for concurrent similarity searches.
+
+Chat requests that arrive within a few milliseconds of each other are
+coalesced into a single embedding API call and a single pgvector query,
+instead of paying both round-trips once per request.
+"""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+from uuid import UUID
+from langchain.schema import Document
+
+if TYPE_CHECKING:
+    from app.repositories.vector_store import VectorStoreRepository
+
+logger = logging.getLogger(__name__)
+
+# (query, session_id, k, future resolved with that query's results)
+_PendingSearch = Tuple[str, UUID, int, "asyncio.Future[List[Document]]"]
+
+
+def _fail(batch: List[_PendingSearch], error: BaseException) -> None:
+    """Resolve every still-waiting search of a batch with an error."""
+    for *_, future in batch:
+        if not future.done():  # Caller may have been cancelled
+            future.set_exception(error)
+
+
+class BatchingSearcher:
+    """
+    Collects pending searches on a queue and flushes them in batches.
+    A batch is flushed once it holds max_batch_size requests, or window
+    seconds after its first request arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        repo: "VectorStoreRepository",
+        window: float,
+        max_batch_size: int
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            repo: Vector store repository used to embed and search
+            window: Max seconds to wait for more requests to join a batch
+            max_batch_size: Max searches per batch
+        """
+        self.repo = repo
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._queue: Optional["asyncio.Queue[_PendingSearch]"] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def search(
+        self,
+        query: str,
+        session_id: UUID,
+        k: int = 4
+    ) -> List[Document]:
+        """
+        Queue a session-filtered search and wait for its batch to complete.
+
+        Args:
+            query: The search query
+            session_id: Session UUID for filtering
+            k: Number of results to return
+
+        Returns:
+            List of most similar documents from this session only
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, session_id, k, future))
+        return await future
+
+    async def close(self) -> None:
+        """
+        Cancel the collector and wait for in-flight batches. Searches that
+        haven't been flushed yet fail with CancelledError.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+            while not self._queue.empty():
+                _fail([self._queue.get_nowait()], asyncio.CancelledError())
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _collect(self) -> None:
+        """Group queued searches into batches and hand them off for flushing."""
+        loop = asyncio.get_running_loop()
+        batch: List[_PendingSearch] = []
+
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.window
+
+                while len(batch) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Flush concurrently so the next batch can start collecting
+                task = asyncio.create_task(self._flush(batch))
+                self._flushes.add(task)
+                task.add_done_callback(self._flushes.discard)
+                batch = []  # Owned by the flush now
+        except asyncio.CancelledError:
+            # Closed while collecting; don't leave these callers waiting
+            _fail(batch, asyncio.CancelledError())
+            raise
+
+    async def _flush(self, batch: List[_PendingSearch]) -> None:
+        """
+        Embed and search a whole batch, then resolve each caller's future.
+
+        Args:
+            batch: Pending searches
+        """
+        try:
+            embeddings = await self.repo.embed_queries([query for query, _, _, _ in batch])
+            results = await self.repo.similarity_search_batch(
+                embeddings=embeddings,
+                session_ids=[session_id for _, session_id, _, _ in batch],
+                k=max(k for _, _, k, _ in batch)
+            )
+        except Exception as e:
+            logger.error(f"Batched vector search failed for {len(batch)} queries: {e}")
+            _fail(batch, e)
+            return
+
+        logger.info(f"Served {len(batch)} vector searches in one batch")
+        for (_, _, k, future), documents in zip(batch, results):
+            if not future.done():  # Caller may have been cancelled
+                future.set_result(documents[:k])
@@ -2,7 +2,7 @@
 import logging
 from typing import List, Dict
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.message import ChatMessage
 
@@ -50,6 +50,31 @@ class ChatRepository:
         logger.info(f"Saved {role} message to session {session_id}")
         return message
     
+    async def add_messages(
+        self,
+        session_id: UUID,
+        messages: List[Dict]
+    ) -> None:
+        """
+        Save several messages with a single multi-row INSERT.
+        
+        Args:
+            session_id: Session UUID
+            messages: Dicts with 'role', 'content' and 'created_at'.
+                Explicit timestamps keep messages ordered even though they
+                are written in the same transaction.
+        """
+        if not messages:
+            return
+        
+        stmt = insert(ChatMessage).values([
+            {"session_id": session_id, **message}
+            for message in messages
+        ])
+        await self.db.execute(stmt)
+        
+        logger.info(f"Saved {len(messages)} messages to session {session_id}")
+    
     async def get_history(
         self,
         session_id: UUID,
@@ -63,26 +88,21 @@ class ChatRepository:
             limit: Maximum number of messages to retrieve
             
         Returns:
-            List of message dictionaries ordered by creation time
+            List of {'role', 'content'} dictionaries ordered by creation time
         """
+        # Only the columns the prompt needs; rows skip ORM materialization
         stmt = (
-            select(ChatMessage)
+            select(ChatMessage.role, ChatMessage.content)
             .where(ChatMessage.session_id == session_id)
             .order_by(ChatMessage.created_at.desc())
             .limit(limit)
         )
         
         result = await self.db.execute(stmt)
-        messages = result.scalars().all()
+        rows = result.all()
         
         # Reverse to get chronological order
-        messages = list(reversed(messages))
-        
         return [
-            {
-                "role": msg.role,
-                "content": msg.content,
-                "created_at": msg.created_at
-            }
-            for msg in messages
+            {"role": role, "content": content}
+            for role, content in reversed(rows)
         ]
@@ -1,7 +1,8 @@
 """Document repository for managing uploaded documents."""
 import logging
+from typing import Optional
 from uuid import UUID
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from app.models.document import Document
 
 logger = logging.getLogger(__name__)
@@ -52,6 +53,18 @@ class DocumentRepository:
         logger.info(f"Created document record: {filename} for session {session_id}")
         return document
     
+    async def get_document(self, document_id: UUID) -> Optional[Document]:
+        """
+        Fetch a document record by id.
+        
+        Args:
+            document_id: Document UUID
+            
+        Returns:
+            Document instance, or None if it doesn't exist
+        """
+        return await self.db.get(Document, document_id)
+    
     async def update_status(
         self,
         document_id: UUID,
@@ -62,7 +75,7 @@ class DocumentRepository:
         
         Args:
             document_id: Document UUID
-            status: New status ('pending', 'processing', 'indexed', 'failed')
+            status: New status ('pending', 'indexed', 'failed')
         """
         from sqlalchemy import select, update
         
@@ -76,3 +89,17 @@ class DocumentRepository:
         await self.db.flush()
         
         logger.info(f"Updated document {document_id} status to: {status}")
+    
+    async def connection(self) -> AsyncConnection:
+        """
+        Get the connection this repository's session runs on, so other
+        writes can share its transaction.
+        
+        Returns:
+            AsyncConnection with the session's transaction
+        """
+        return await self.db.connection()
+    
+    async def rollback(self) -> None:
+        """Discard everything written in the current transaction."""
+        await self.db.rollback()
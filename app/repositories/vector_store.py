@@ -3,16 +3,269 @@
 This module handles all interactions with the pgvector database for
 storing and retrieving document embeddings with session isolation.
 """
+import asyncio
+import hashlib
 import logging
-from typing import List
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
 from uuid import UUID
-from langchain_community.vectorstores import PGVector
+import blake3
+import httpx
+import numpy as np
+import orjson
+from sqlalchemy import Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncConnection
+from langchain_postgres import PGVector
+from langchain_postgres.vectorstores import DistanceStrategy
 from langchain_openai import OpenAIEmbeddings
 from langchain.schema import Document
 from app.config import settings
+from app.database import engine
+from app.repositories.batching_searcher import BatchingSearcher
 
 logger = logging.getLogger(__name__)
 
+COLLECTION_NAME = "documents"
+
+# langchain_postgres stores embeddings as an untyped vector column, so
+# exact distances are computed on a fixed-size cast
+_EMBEDDING_EXPR = f"(embedding::vector({settings.EMBEDDING_DIMENSION}))"
+
+# Representation the HNSW index (and the coarse search pass) uses, per
+# VECTOR_PRECISION. Lower precisions are stored generated columns of the FP32
+# embedding: halfvec halves the bytes per distance, bit cuts them 32x.
+_PRECISIONS = {
+    "vector": {
+        "column": None,
+        "index_expr": _EMBEDDING_EXPR,
+        "ops": "vector_cosine_ops",
+        "index": "langchain_pg_embedding_hnsw",
+        "query_expr": "v.embedding",
+        "operator": "<=>",
+    },
+    "halfvec": {
+        "column": (
+            "embedding_half",
+            f"halfvec({settings.EMBEDDING_DIMENSION})",
+            f"embedding::halfvec({settings.EMBEDDING_DIMENSION})",
+        ),
+        "index_expr": "embedding_half",
+        "ops": "halfvec_cosine_ops",
+        "index": "langchain_pg_embedding_hnsw_half",
+        "query_expr": f"CAST(v.embedding AS halfvec({settings.EMBEDDING_DIMENSION}))",
+        "operator": "<=>",
+    },
+    "bit": {
+        "column": (
+            "embedding_bit",
+            f"bit({settings.EMBEDDING_DIMENSION})",
+            f"binary_quantize(embedding)::bit({settings.EMBEDDING_DIMENSION})",
+        ),
+        "index_expr": "embedding_bit",
+        "ops": "bit_hamming_ops",
+        "index": "langchain_pg_embedding_hnsw_bit",
+        "query_expr": f"binary_quantize(v.embedding)::bit({settings.EMBEDDING_DIMENSION})",
+        "operator": "<~>",  # Hamming distance
+    },
+}
+_PRECISION = _PRECISIONS[settings.VECTOR_PRECISION]
+
+
+def _precision_ddl() -> tuple:
+    """Create the configured coarse column/index and drop the others."""
+    statements = []
+    for name, precision in _PRECISIONS.items():
+        column = precision["column"]
+        if name != settings.VECTOR_PRECISION:
+            statements.append(f"DROP INDEX CONCURRENTLY IF EXISTS {precision['index']}")
+            if column is not None:
+                statements.append(f"ALTER TABLE langchain_pg_embedding DROP COLUMN IF EXISTS {column[0]}")
+            continue
+        
+        if column is not None:
+            statements.append(f"""
+            ALTER TABLE langchain_pg_embedding
+            ADD COLUMN IF NOT EXISTS {column[0]} {column[1]}
+            GENERATED ALWAYS AS ({column[2]}) STORED
+            """)
+        statements.append(f"""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS {precision['index']}
+        ON langchain_pg_embedding
+        USING hnsw ({precision['index_expr']} {precision['ops']})
+        WITH (m = {settings.HNSW_M}, ef_construction = {settings.HNSW_EF_CONSTRUCTION})
+        """)
+    return tuple(statements)
+
+
+_SCHEMA_LOCK_KEY = 0x7261675f766563  # Arbitrary advisory lock id ("rag_vec")
+
+# Run in order with AUTOCOMMIT: CREATE INDEX CONCURRENTLY can't run in a
+# transaction. session_id and document_id are real uuid columns, written
+# directly by copy_documents, so the session filter can use a btree index.
+_SCHEMA_DDL = (
+    "ALTER TABLE langchain_pg_embedding ADD COLUMN IF NOT EXISTS session_id uuid",
+    "ALTER TABLE langchain_pg_embedding ADD COLUMN IF NOT EXISTS document_id uuid",
+    # Superseded by copy_documents writing the columns
+    "DROP TRIGGER IF EXISTS langchain_pg_embedding_session_id ON langchain_pg_embedding",
+    "DROP FUNCTION IF EXISTS langchain_pg_embedding_set_session_id()",
+    # Backfill rows written before the columns existed
+    """
+    UPDATE langchain_pg_embedding
+    SET session_id = COALESCE(session_id, (cmetadata->>'session_id')::uuid),
+        document_id = COALESCE(document_id, (cmetadata->>'document_id')::uuid)
+    WHERE session_id IS NULL OR document_id IS NULL
+    """,
+    """
+    ALTER TABLE langchain_pg_embedding
+    ALTER COLUMN session_id SET NOT NULL,
+    ALTER COLUMN document_id SET NOT NULL
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS langchain_pg_embedding_session_id
+    ON langchain_pg_embedding (session_id)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS langchain_pg_embedding_document_id
+    ON langchain_pg_embedding (document_id)
+    """,
+    # Superseded by the session_id column index
+    "DROP INDEX CONCURRENTLY IF EXISTS langchain_pg_embedding_session",
+    # Chat history lookups (see init_db.sql), for databases created before it
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chat_messages_session_created
+    ON chat_messages (session_id, created_at DESC)
+    """,
+    "DROP INDEX CONCURRENTLY IF EXISTS idx_chat_messages_session",
+    # halfvec and binary_quantize need pgvector >= 0.7
+    "ALTER EXTENSION vector UPDATE",
+    # Embeddings of chunk texts already seen (boilerplate, re-uploads)
+    f"""
+    CREATE TABLE IF NOT EXISTS embedding_cache (
+        content_hash bytea PRIMARY KEY,
+        embedding vector({settings.EMBEDDING_DIMENSION}) NOT NULL
+    )
+    """,
+    # Chunk text and metadata live in their own table, keeping embedding
+    # rows narrow (more vectors per page for the ANN scan)
+    """
+    CREATE TABLE IF NOT EXISTS document_chunks (
+        id uuid PRIMARY KEY,
+        document_id uuid NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+        content text NOT NULL,
+        metadata jsonb
+    )
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS document_chunks_document_id
+    ON document_chunks (document_id)
+    """,
+    """
+    ALTER TABLE langchain_pg_embedding
+    ADD COLUMN IF NOT EXISTS chunk_id uuid REFERENCES document_chunks(id) ON DELETE CASCADE
+    """,
+    # Move text written before the split (embedding ids are uuid4 strings)
+    """
+    INSERT INTO document_chunks (id, document_id, content, metadata)
+    SELECT id::uuid, document_id, document, cmetadata
+    FROM langchain_pg_embedding
+    WHERE chunk_id IS NULL
+      AND document_id IN (SELECT id FROM documents)
+    ON CONFLICT (id) DO NOTHING
+    """,
+    """
+    UPDATE langchain_pg_embedding e
+    SET chunk_id = e.id::uuid, document = NULL, cmetadata = NULL
+    WHERE e.chunk_id IS NULL
+      AND EXISTS (SELECT 1 FROM document_chunks ch WHERE ch.id = e.id::uuid)
+    """,
+) + _precision_ddl()
+
+# The u.idx-th (1-based) vector of the flat float4[] :embeddings parameter,
+# which holds EMBEDDING_DIMENSION values per vector (see _flatten)
+_VECTOR_SLICE = (
+    f"CAST((CAST(:embeddings AS real[]))"
+    f"[(u.idx - 1) * {settings.EMBEDDING_DIMENSION} + 1 : u.idx * {settings.EMBEDDING_DIMENSION}]"
+    f" AS vector({settings.EMBEDDING_DIMENSION}))"
+)
+
+# One round-trip for any number of (embedding, session) queries: each row of
+# the unnested arrays gets its own session-filtered KNN scan via LATERAL.
+# The scan picks :candidates rows on the VECTOR_PRECISION index, which are
+# then reranked by exact FP32 distance to keep the top :k.
+_BATCH_SEARCH_SQL = text(f"""
+    WITH q AS MATERIALIZED (
+        -- Build each query vector once, not once per compared row
+        SELECT v.embedding, {_PRECISION["query_expr"]} AS embedding_coarse, v.session_id, v.idx
+        FROM (
+            SELECT {_VECTOR_SLICE} AS embedding, u.session_id, u.idx
+            FROM unnest(CAST(:session_ids AS uuid[])) WITH ORDINALITY AS u(session_id, idx)
+        ) v
+    )
+    SELECT q.idx, ch.content AS document, ch.metadata AS cmetadata
+    FROM q
+    CROSS JOIN LATERAL (
+        SELECT c.chunk_id, {_EMBEDDING_EXPR} <=> q.embedding AS distance
+        FROM (
+            SELECT e.embedding, e.chunk_id
+            FROM langchain_pg_embedding e
+            WHERE e.collection_id = (
+                SELECT uuid FROM langchain_pg_collection WHERE name = :collection_name
+            )
+              AND e.session_id = q.session_id
+            ORDER BY {_PRECISION["index_expr"]} {_PRECISION["operator"]} q.embedding_coarse
+            LIMIT :candidates
+        ) c
+        ORDER BY distance
+        LIMIT :k
+    ) r
+    -- Text is only fetched for the final top-k
+    JOIN document_chunks ch ON ch.id = r.chunk_id
+    ORDER BY q.idx, r.distance
+""").columns(idx=Integer, document=String, cmetadata=JSONB)
+
+
+_CACHE_LOOKUP_SQL = text("""
+    SELECT content_hash, embedding
+    FROM embedding_cache
+    WHERE content_hash = ANY(CAST(:hashes AS bytea[]))
+""")
+
+_CACHE_INSERT_SQL = text(f"""
+    INSERT INTO embedding_cache (content_hash, embedding)
+    SELECT u.content_hash, {_VECTOR_SLICE}
+    FROM unnest(CAST(:hashes AS bytea[])) WITH ORDINALITY AS u(content_hash, idx)
+    ON CONFLICT (content_hash) DO NOTHING
+""")
+
+# Columns written by copy_documents (the coarse column is generated)
+_CHUNK_COLUMNS = ["id", "document_id", "content", "metadata"]
+_EMBEDDING_COLUMNS = ["id", "collection_id", "session_id", "document_id", "chunk_id", "embedding"]
+
+
+def _content_hash(text: str) -> bytes:
+    """Key a chunk's embedding by model and exact text."""
+    return blake3.blake3(f"{settings.EMBEDDING_MODEL}\0{text}".encode()).digest()
+
+
+def _flatten(embeddings: List[List[float]]) -> List[float]:
+    """
+    Concatenate embeddings into one float4[] parameter, sent in binary.
+    asyncpg can't bind the vector codec's arrays as elements of a vector[]
+    parameter, so SQL slices the flat array back into vectors (_VECTOR_SLICE).
+    """
+    return [value for embedding in embeddings for value in embedding]
+
+
+def _to_float32(embeddings: List[List[float]]) -> List[np.ndarray]:
+    """
+    Convert embeddings for the binary vector codec with one vectorized copy.
+    Rows are big-endian float32 (pgvector's wire format), so the codec's
+    own asarray + tobytes is a plain memcpy per row.
+    """
+    return list(np.ascontiguousarray(embeddings, dtype=">f4"))
+
 
 class VectorStoreRepository:
     """
@@ -20,48 +273,261 @@ class VectorStoreRepository:
     Enforces session-based isolation for security.
     """
     
-    def __init__(self):
-        """Initialize the vector store with OpenAI embeddings."""
+    def __init__(self, http_client: httpx.AsyncClient):
+        """
+        Initialize the vector store with OpenAI embeddings.
+        
+        Args:
+            http_client: Shared HTTP client for embedding API calls
+        """
         self.embeddings = OpenAIEmbeddings(
             model=settings.EMBEDDING_MODEL,
-            openai_api_key=settings.OPENAI_API_KEY
+            openai_api_key=settings.OPENAI_API_KEY,
+            chunk_size=settings.EMBEDDING_BATCH_SIZE,  # Texts per API request
+            http_async_client=http_client
         )
         
+        # Share the app's asyncpg engine (and its connection pool)
         self.vector_store = PGVector(
-            connection_string=settings.DATABASE_URL.replace('+asyncpg', ''),  # PGVector uses psycopg2
-            embedding_function=self.embeddings,
-            collection_name="documents",
-            distance_strategy="cosine"
+            embeddings=self.embeddings,
+            connection=engine,
+            collection_name=COLLECTION_NAME,
+            distance_strategy=DistanceStrategy.COSINE,
+            use_jsonb=True,
+            create_extension=False,  # Created by init_db.sql
+            async_mode=True
+        )
+        
+        # Resolved on first write, see _get_collection_id
+        self._collection_id: Optional[UUID] = None
+        
+        # LRU of query embeddings keyed by SHA-256 of the normalized query
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        
+        # Coalesces concurrent chat searches into one embedding call + one query
+        self.batcher = BatchingSearcher(
+            self,
+            window=settings.SEARCH_BATCH_WINDOW_MS / 1000,
+            max_batch_size=settings.SEARCH_BATCH_MAX_SIZE
         )
     
-    async def add_documents(self, documents: List[Document]) -> None:
+    async def ensure_schema(self) -> None:
         """
-        Add documents to the vector store.
-        Each document MUST have session_id in metadata.
+        Create the collection and chunk tables, the session/document
+        columns, the HNSW / session filter indexes and the chat history
+        index.
+        Idempotent, so it is safe to run on every startup.
+        """
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            # Serialize across uvicorn workers starting at the same time. Poll
+            # instead of blocking in pg_advisory_lock: a waiting statement keeps
+            # a transaction open, which CREATE INDEX CONCURRENTLY waits on forever
+            while not await conn.scalar(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": _SCHEMA_LOCK_KEY}
+            ):
+                await asyncio.sleep(0.5)
+            try:
+                # Lazily creates langchain_pg_* tables and the collection row
+                await self.vector_store.acreate_collection()
+                
+                for statement in _SCHEMA_DDL:
+                    await conn.execute(text(statement))
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _SCHEMA_LOCK_KEY})
+        
+        logger.info("Vector store schema ready")
+    
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed chunk texts, only calling the embedding API for texts that
+        aren't in the embedding cache.
         
         Args:
-            documents: List of LangChain Document objects with metadata
+            texts: Chunk texts
             
-        Raises:
-            ValueError: If session_id missing from any document metadata
-        """
-        # Validate session_id exists in metadata
-        for doc in documents:
-            if "session_id" not in doc.metadata:
-                raise ValueError(
-                    f"session_id required in document metadata. "
-                    f"Got metadata: {doc.metadata}"
+        Returns:
+            One embedding per text, in input order
+        """
+        if not texts:
+            return []
+        
+        hashes = [_content_hash(t) for t in texts]
+        async with engine.connect() as conn:
+            rows = await conn.execute(_CACHE_LOOKUP_SQL, {"hashes": list(set(hashes))})
+            found = {row.content_hash: row.embedding for row in rows}
+        
+        missing = {}
+        for content_hash, text_ in zip(hashes, texts):
+            if content_hash not in found:
+                missing.setdefault(content_hash, text_)
+        
+        if missing:
+            # Insert in hash order so concurrent jobs lock rows in the same order
+            ordered = sorted(missing)
+            vectors = await self._embed_texts([missing[h] for h in ordered])
+            async with engine.begin() as conn:
+                await conn.execute(
+                    _CACHE_INSERT_SQL,
+                    {"hashes": ordered, "embeddings": _flatten(vectors)}
                 )
+            found.update(zip(ordered, vectors))
+        
+        logger.info(f"Embedded {len(missing)} of {len(texts)} chunks, rest from cache")
+        return [found[content_hash] for content_hash in hashes]
+    
+    async def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in large batches, keeping a bounded number of
+        batches in flight.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            One embedding per text, in input order
+        """
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        if len(texts) <= batch_size:
+            # Most documents fit in a single request
+            return await self.embeddings.aembed_documents(texts)
+        
+        semaphore = asyncio.Semaphore(settings.EMBEDDING_CONCURRENCY)
+        
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+        
+        batches = await asyncio.gather(*[
+            embed_batch(texts[i:i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ])
+        return [embedding for batch in batches for embedding in batch]
+    
+    async def copy_documents(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]],
+        session_id: UUID,
+        document_id: UUID,
+        conn: Optional[AsyncConnection] = None
+    ) -> None:
+        """
+        Bulk-load embedded chunks of one uploaded document with a single
+        binary COPY.
+        
+        Args:
+            documents: List of LangChain Document objects with metadata
+            embeddings: One embedding per document
+            session_id: Session UUID the chunks belong to (⭐ isolation key)
+            document_id: Uploaded document the chunks came from
+            conn: Connection whose open transaction the COPY should join
+                (default: run in a transaction of its own)
+        """
+        logger.info(f"Copying {len(documents)} documents to vector store")
+        
+        if conn is None:
+            async with engine.begin() as own_conn:
+                await self._copy(own_conn, documents, embeddings, session_id, document_id)
+        else:
+            await self._copy(conn, documents, embeddings, session_id, document_id)
         
-        logger.info(f"Adding {len(documents)} documents to vector store")
-        await self.vector_store.aadd_documents(documents)
         logger.info(f"Successfully added {len(documents)} documents")
     
+    async def _copy(
+        self,
+        conn: AsyncConnection,
+        documents: List[Document],
+        embeddings: List[List[float]],
+        session_id: UUID,
+        document_id: UUID
+    ) -> None:
+        """Run the COPY for copy_documents on the given connection."""
+        collection_id = await self._get_collection_id(conn)
+        chunk_ids = [uuid.uuid4() for _ in documents]
+        
+        # COPY goes through asyncpg directly, inside whatever transaction the
+        # connection has open; vectors use the binary codec registered on it
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        await driver.copy_records_to_table(
+            "document_chunks",
+            records=[
+                (chunk_id, document_id, doc.page_content, orjson.dumps(doc.metadata).decode())
+                for chunk_id, doc in zip(chunk_ids, documents)
+            ],
+            columns=_CHUNK_COLUMNS
+        )
+        await driver.copy_records_to_table(
+            "langchain_pg_embedding",
+            records=[
+                (str(chunk_id), collection_id, session_id, document_id, chunk_id, embedding)
+                for chunk_id, embedding in zip(chunk_ids, _to_float32(embeddings))
+            ],
+            columns=_EMBEDDING_COLUMNS
+        )
+    
+    async def _get_collection_id(self, conn: AsyncConnection) -> UUID:
+        """Look up (once) the uuid of this repository's collection."""
+        if self._collection_id is None:
+            result = await conn.execute(
+                text("SELECT uuid FROM langchain_pg_collection WHERE name = :name"),
+                {"name": COLLECTION_NAME}
+            )
+            self._collection_id = result.scalar_one()
+        return self._collection_id
+    
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, reusing the cached vector for repeated questions.
+        
+        Args:
+            query: The search query
+            
+        Returns:
+            Query embedding
+        """
+        embeddings = await self.embed_queries([query])
+        return embeddings[0]
+    
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed several search queries with a single API call for cache misses.
+        
+        Args:
+            queries: Search queries
+            
+        Returns:
+            One embedding per query, in input order
+        """
+        keys = [hashlib.sha256(q.lower().strip().encode()).hexdigest() for q in queries]
+        
+        found = {}
+        missing = {}
+        for key, query in zip(keys, queries):
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                found[key] = cached
+            else:
+                missing.setdefault(key, query)
+        
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            for key, embedding in zip(missing, vectors):
+                found[key] = embedding
+                self._query_cache[key] = embedding
+                if len(self._query_cache) > settings.QUERY_EMBEDDING_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        
+        return [found[key] for key in keys]
+    
     async def similarity_search(
         self,
         query: str,
         session_id: UUID,
-        k: int = 4
+        k: int = 4,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Document]:
         """
         ⭐ CRITICAL: Search with session isolation.
@@ -74,22 +540,23 @@ class VectorStoreRepository:
             query: The search query
             session_id: Session UUID for filtering
             k: Number of results to return
+            query_embedding: Precomputed query embedding (skips embedding call)
             
         Returns:
             List of most similar documents from this session only
         """
-        # Build metadata filter - CRITICAL for session isolation
-        filter_dict = {"session_id": str(session_id)}
-        
         logger.info(f"Searching vectors for session {session_id} with query: {query[:50]}...")
         
         try:
-            # Perform filtered search - filter BEFORE vector search
-            results = await self.vector_store.asimilarity_search(
-                query=query,
-                k=k,
-                filter=filter_dict  # ⭐ Pre-filter before vector search
-            )
+            if query_embedding is None:
+                # Shares embedding + SQL round-trips with concurrent requests
+                results = await self.batcher.search(query, session_id, k)
+            else:
+                results = await self.similarity_search_by_vector(
+                    embedding=query_embedding,
+                    session_id=session_id,
+                    k=k
+                )
             
             logger.info(f"Found {len(results)} results for session {session_id}")
             return results
@@ -98,3 +565,78 @@ class VectorStoreRepository:
             logger.error(f"Vector search failed for session {session_id}: {e}")
             # Return empty list on failure (graceful degradation)
             return []
+    
+    async def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        session_id: UUID,
+        k: int = 4
+    ) -> List[Document]:
+        """
+        Session-filtered KNN search for a precomputed embedding.
+        
+        Args:
+            embedding: Query embedding
+            session_id: Session UUID for filtering
+            k: Number of results to return
+            
+        Returns:
+            List of most similar documents from this session only
+        """
+        results = await self.similarity_search_batch(
+            embeddings=[embedding],
+            session_ids=[session_id],
+            k=k
+        )
+        return results[0]
+    
+    async def similarity_search_batch(
+        self,
+        embeddings: List[List[float]],
+        session_ids: List[UUID],
+        k: int = 4
+    ) -> List[List[Document]]:
+        """
+        Run several session-filtered KNN searches in one SQL round-trip.
+        
+        Args:
+            embeddings: Query embeddings
+            session_ids: Session UUID to filter each query by
+            k: Number of results to return per query
+            
+        Returns:
+            One result list per query, in input order
+        """
+        results: List[List[Document]] = [[] for _ in embeddings]
+        
+        candidates = k * settings.VECTOR_RERANK_FACTOR
+        
+        async with engine.begin() as conn:
+            # Candidate list size for this transaction only; must be >= candidates
+            ef_search = max(settings.HNSW_EF_SEARCH, candidates * 2)
+            await conn.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+                {"ef_search": str(ef_search)}
+            )
+            
+            # ⭐ Session filter is part of the same query as the KNN scan
+            rows = await conn.execute(
+                _BATCH_SEARCH_SQL,
+                {
+                    "embeddings": _flatten(embeddings),  # ~6 KB binary vs ~30 KB text each
+                    "session_ids": session_ids,  # Binary uuid[], no text round-trip
+                    "collection_name": COLLECTION_NAME,
+                    "candidates": candidates,
+                    "k": k
+                }
+            )
+            for row in rows:
+                results[row.idx - 1].append(
+                    Document(page_content=row.document, metadata=row.cmetadata or {})
+                )
+        
+        return results
+    
+    async def close(self) -> None:
+        """Stop the background search batcher."""
+        await self.batcher.close()
@@ -1,7 +1,8 @@
 """Pydantic schemas for document functionality."""
 from pydantic import BaseModel
 from uuid import UUID
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 
 
 class DocumentResponse(BaseModel):
@@ -10,3 +11,20 @@ class DocumentResponse(BaseModel):
     filename: str
     session_id: UUID
     document_id: Optional[UUID] = None
+
+
+class DocumentBatchResponse(BaseModel):
+    """Response schema for multi-file upload."""
+    message: str
+    session_id: UUID
+    filenames: List[str]
+    document_ids: List[UUID]
+
+
+class DocumentStatusResponse(BaseModel):
+    """Response schema for document processing status."""
+    document_id: UUID
+    session_id: UUID
+    filename: str
+    status: str
+    created_at: datetime
@@ -7,9 +7,12 @@ Handles:
 4. Generating responses with LLM
 5. Saving conversation
 """
+import asyncio
 import logging
-from typing import List, Dict
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Dict
 from uuid import UUID
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage, AIMessage
 from app.repositories.chat_repository import ChatRepository
@@ -18,6 +21,47 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Static parts of the system prompt, built once at import time
+SYSTEM_PREFIX = (
+    "You are a helpful AI assistant. Use the following context from uploaded "
+    "documents to answer the user's question accurately.\n"
+    "\n"
+    "Context from documents:\n"
+)
+SYSTEM_SUFFIX = (
+    "\n"
+    "\n"
+    "Instructions:\n"
+    "- Answer based on the provided context when relevant\n"
+    "- If the context doesn't contain the answer, say so\n"
+    "- Be concise and helpful\n"
+    "- Maintain conversation continuity"
+)
+NO_CONTEXT_PROMPT = "You are a helpful AI assistant. Answer the user's questions concisely and accurately."
+_NO_CONTEXT_MESSAGE = SystemMessage(content=NO_CONTEXT_PROMPT)  # Never mutated
+
+# History role -> LangChain message class ('system' rows are skipped)
+_MESSAGE_TYPES = {"user": HumanMessage, "assistant": AIMessage}
+
+
+def create_llm(http_client: httpx.AsyncClient) -> ChatOpenAI:
+    """
+    Create the chat model. Built once per process and shared by all
+    ChatService instances.
+    
+    Args:
+        http_client: Shared HTTP client for chat completion API calls
+    
+    Returns:
+        ChatOpenAI instance
+    """
+    return ChatOpenAI(
+        model=settings.LLM_MODEL,
+        temperature=0.7,
+        api_key=settings.OPENAI_API_KEY,
+        http_async_client=http_client
+    )
+
 
 class ChatService:
     """
@@ -28,7 +72,8 @@ class ChatService:
     def __init__(
         self,
         chat_repo: ChatRepository,
-        vector_repo: VectorStoreRepository
+        vector_repo: VectorStoreRepository,
+        llm: ChatOpenAI
     ):
         """
         Initialize chat service.
@@ -36,16 +81,11 @@ class ChatService:
         Args:
             chat_repo: Chat repository
             vector_repo: Vector store repository
+            llm: Chat model (shared across requests, see create_llm)
         """
         self.chat_repo = chat_repo
         self.vector_repo = vector_repo
-        
-        # Initialize LLM
-        self.llm = ChatOpenAI(
-            model=settings.LLM_MODEL,
-            temperature=0.7,
-            api_key=settings.OPENAI_API_KEY
-        )
+        self.llm = llm
     
     async def generate_response(
         self,
@@ -56,13 +96,12 @@ class ChatService:
         Generate a response using RAG and chat history.
         
         Flow:
-        1. Save user message
-        2. Retrieve chat history (last 10 messages)
-        3. Retrieve context with session filtering (CRITICAL)
-        4. Build prompt with history + context + message
-        5. Generate response with LLM
-        6. Save assistant response
-        7. Return response
+        1. Retrieve chat history (last 10 messages) and context with
+           session filtering (CRITICAL), concurrently
+        2. Build prompt with history + context + message
+        3. Generate response with LLM
+        4. Save user message and assistant response in one INSERT
+        5. Return response
         
         Args:
             session_id: Session UUID
@@ -71,47 +110,22 @@ class ChatService:
         Returns:
             Assistant's response
         """
+        received_at = datetime.now(timezone.utc)
+        
         try:
-            # 1. Save user message
-            await self.chat_repo.add_message(
-                session_id=session_id,
-                role="user",
-                content=user_message
-            )
-            
-            # 2. Retrieve chat history for context
-            history = await self.chat_repo.get_history(
-                session_id=session_id,
-                limit=10  # Last 10 messages
-            )
-            
-            # 3. ⭐ CRITICAL: Retrieve context with session filtering
-            relevant_docs = await self.vector_repo.similarity_search(
-                query=user_message,
-                session_id=session_id,  # Filter by session
-                k=4  # Top 4 most relevant chunks
-            )
-            
-            # 4. Build context from retrieved documents
-            context = "\n\n".join([doc.page_content for doc in relevant_docs]) if relevant_docs else ""
-            
-            # 5. Build messages for LLM
-            messages = self._build_messages(
-                user_message=user_message,
-                context=context,
-                history=history
-            )
+            messages = await self._prepare_messages(session_id, user_message)
             
-            # 6. Generate response
+            # 3. Generate response
             logger.info(f"Generating response for session {session_id}")
             response = await self.llm.ainvoke(messages)
             assistant_message = response.content
             
-            # 7. Save assistant response
-            await self.chat_repo.add_message(
+            # 4. Save both sides of the exchange
+            await self._save_exchange(
                 session_id=session_id,
-                role="assistant",
-                content=assistant_message
+                user_message=user_message,
+                assistant_message=assistant_message,
+                received_at=received_at
             )
             
             logger.info(f"Generated response for session {session_id}")
@@ -122,6 +136,134 @@ class ChatService:
             # Graceful degradation: respond without RAG
             return await self._fallback_response(user_message)
     
+    async def stream_response(
+        self,
+        session_id: UUID,
+        user_message: str
+    ) -> AsyncIterator[str]:
+        """
+        Same flow as generate_response, but yields the answer as
+        Server-Sent Events while the LLM produces it.
+        
+        Args:
+            session_id: Session UUID
+            user_message: User's message
+            
+        Yields:
+            SSE-formatted chunks of the assistant's response
+        """
+        received_at = datetime.now(timezone.utc)
+        streamed = False
+        
+        try:
+            messages = await self._prepare_messages(session_id, user_message)
+            
+            logger.info(f"Streaming response for session {session_id}")
+            parts = []
+            async for chunk in self.llm.astream(messages):
+                if chunk.content:
+                    parts.append(chunk.content)
+                    streamed = True
+                    yield self._sse_event(chunk.content)
+            
+            # Save the exchange once streaming finished
+            await self._save_exchange(
+                session_id=session_id,
+                user_message=user_message,
+                assistant_message="".join(parts),
+                received_at=received_at
+            )
+            
+            logger.info(f"Streamed response for session {session_id}")
+            
+        except Exception as e:
+            logger.error(f"Chat streaming failed for session {session_id}: {e}")
+            # Graceful degradation only if the client hasn't received anything yet
+            if not streamed:
+                yield self._sse_event(await self._fallback_response(user_message))
+        
+        yield "event: done\ndata: \n\n"
+    
+    async def _prepare_messages(
+        self,
+        session_id: UUID,
+        user_message: str
+    ) -> List:
+        """
+        Build the LLM prompt from chat history + RAG context.
+        
+        Args:
+            session_id: Session UUID
+            user_message: User's message
+            
+        Returns:
+            List of LangChain message objects
+        """
+        # 1. Retrieve chat history and ⭐ session-filtered context concurrently.
+        # Safe to overlap: history uses this request's DB session, while the
+        # vector search runs on its own pooled connection.
+        history, relevant_docs = await asyncio.gather(
+            self.chat_repo.get_history(
+                session_id=session_id,
+                limit=10  # Last 10 messages
+            ),
+            self.vector_repo.similarity_search(
+                query=user_message,
+                session_id=session_id,  # Filter by session
+                k=4  # Top 4 most relevant chunks
+            )
+        )
+        
+        # 2. Build context from retrieved documents
+        context = "\n\n".join([doc.page_content for doc in relevant_docs]) if relevant_docs else ""
+        
+        return self._build_messages(
+            user_message=user_message,
+            context=context,
+            history=history
+        )
+    
+    async def _save_exchange(
+        self,
+        session_id: UUID,
+        user_message: str,
+        assistant_message: str,
+        received_at: datetime
+    ) -> None:
+        """
+        Persist the user message and assistant response in one round-trip.
+        
+        Args:
+            session_id: Session UUID
+            user_message: User's message
+            assistant_message: Assistant's response
+            received_at: When the user message arrived
+        """
+        await self.chat_repo.add_messages(
+            session_id=session_id,
+            messages=[
+                {"role": "user", "content": user_message, "created_at": received_at},
+                {
+                    "role": "assistant",
+                    "content": assistant_message,
+                    "created_at": datetime.now(timezone.utc)
+                }
+            ]
+        )
+    
+    @staticmethod
+    def _sse_event(data: str) -> str:
+        """
+        Format text as one SSE message (multi-line text spans several data: lines).
+        
+        Args:
+            data: Event payload
+            
+        Returns:
+            SSE-formatted event
+        """
+        return "".join(f"data: {line}\n" for line in data.split("\n")) + "\n"
+    
     def _build_messages(
         self,
         user_message: str,
@@ -139,31 +281,17 @@ class ChatService:
         Returns:
             List of LangChain message objects
         """
-        messages = []
-        
         # System message with context
         if context:
-            system_content = f"""You are a helpful AI assistant. Use the following context from uploaded documents to answer the user's question accurately.
-
-Context from documents:
-{context}
-
-Instructions:
-- Answer based on the provided context when relevant
-- If the context doesn't contain the answer, say so
-- Be concise and helpful
-- Maintain conversation continuity"""
+            messages = [SystemMessage(content=SYSTEM_PREFIX + context + SYSTEM_SUFFIX)]
         else:
-            system_content = "You are a helpful AI assistant. Answer the user's questions concisely and accurately."
-        
-        messages.append(SystemMessage(content=system_content))
+            messages = [_NO_CONTEXT_MESSAGE]
         
         # Add conversation history (last 3 exchanges = 6 messages)
         for msg in history[-6:]:
-            if msg['role'] == 'user':
-                messages.append(HumanMessage(content=msg['content']))
-            elif msg['role'] == 'assistant':
-                messages.append(AIMessage(content=msg['content']))
+            message_type = _MESSAGE_TYPES.get(msg['role'])
+            if message_type is not None:
+                messages.append(message_type(content=msg['content']))
         
         # Add current user message
         messages.append(HumanMessage(content=user_message))
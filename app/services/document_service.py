@@ -6,13 +6,18 @@ Handles the complete pipeline for processing uploaded documents:
 3. Generate embeddings
 4. Store in pgvector with session metadata
 """
+import asyncio
+import io
 import logging
-import tempfile
 import os
-from typing import BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
 from uuid import UUID
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from pypdf import PdfReader
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from semantic_text_splitter import TextSplitter
 from app.repositories.vector_store import VectorStoreRepository
 from app.repositories.document_repository import DocumentRepository
 from app.config import settings
@@ -20,6 +25,83 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
+# Both splitters are stateless between calls, so one instance serves every
+# DocumentService (they are built per request)
+if settings.TEXT_SPLITTER == "semantic":
+    # Rust splitter measuring length in characters (no Python callback)
+    _SPLITTER = TextSplitter(
+        capacity=settings.CHUNK_SIZE,
+        overlap=settings.CHUNK_OVERLAP
+    )
+else:
+    _SPLITTER = RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE,
+        chunk_overlap=settings.CHUNK_OVERLAP,
+        separators=["\n\n", "\n", ". ", " ", ""]
+    )
+
+
+_PARSE_WORKERS = os.cpu_count() or 1
+
+# File reads and text extraction run here so they don't block the event loop
+_parse_executor = ThreadPoolExecutor(max_workers=_PARSE_WORKERS, thread_name_prefix="parse")
+
+
+def _count_pages(data: bytes) -> int:
+    """Count the pages of a PDF without extracting any text."""
+    return len(PdfReader(io.BytesIO(data)).pages)
+
+
+def _extract_pages(data: bytes, start: int, stop: int) -> List[str]:
+    """
+    Extract the text of pages [start, stop). Each call opens its own
+    reader, since a PdfReader's stream can't be shared between threads.
+    """
+    reader = PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+async def _parse_pdf(data: bytes, filename: str) -> List[Document]:
+    """Extract one Document per PDF page, splitting the pages across threads."""
+    loop = asyncio.get_running_loop()
+    page_count = await loop.run_in_executor(_parse_executor, _count_pages, data)
+    
+    step = -(-page_count // _PARSE_WORKERS) or 1  # Ceiling division
+    ranges = await asyncio.gather(*[
+        loop.run_in_executor(_parse_executor, _extract_pages, data, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ])
+    
+    texts = [text for page_texts in ranges for text in page_texts]
+    return [
+        Document(page_content=text, metadata={"source": filename, "page": i})
+        for i, text in enumerate(texts)
+    ]
+
+
+async def _parse_text(data: bytes, filename: str) -> List[Document]:
+    """Wrap a text file in a single Document."""
+    return [Document(page_content=data.decode("utf-8", errors="replace"), metadata={"source": filename})]
+
+
+def _merge_small_chunks(chunks: List[Document]) -> List[Document]:
+    """
+    Fold chunks shorter than MIN_CHUNK_SIZE into the adjacent chunk of the
+    same page, so context-poor fragments don't each cost an embedding.
+    """
+    merged: List[Document] = []
+    for chunk in chunks:
+        if (
+            merged
+            and merged[-1].metadata == chunk.metadata
+            and min(len(merged[-1].page_content), len(chunk.page_content)) < settings.MIN_CHUNK_SIZE
+        ):
+            merged[-1].page_content += "\n" + chunk.page_content
+        else:
+            merged.append(chunk)
+    return merged
+
+
 class DocumentService:
     """
     Handles document ingestion pipeline with proper error handling
@@ -40,32 +122,83 @@ class DocumentService:
         """
         self.vector_repo = vector_repo
         self.doc_repo = doc_repo
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=settings.CHUNK_SIZE,
-            chunk_overlap=settings.CHUNK_OVERLAP,
-            separators=["\n\n", "\n", ". ", " ", ""]
+        self.text_splitter = _SPLITTER
+    
+    def _split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Split documents into chunks that keep their source metadata.
+        
+        Args:
+            documents: Parsed pages/sections
+            
+        Returns:
+            List of chunk Documents
+        """
+        if sum(len(doc.page_content) for doc in documents) <= settings.CHUNK_SIZE:
+            # Already fits in one chunk per page/section; skip the splitter
+            return [doc for doc in documents if doc.page_content.strip()]
+        
+        if isinstance(self.text_splitter, TextSplitter):
+            chunks = [
+                Document(page_content=text, metadata=doc.metadata.copy())
+                for doc in documents
+                for text in self.text_splitter.chunks(doc.page_content)
+            ]
+        else:
+            chunks = self.text_splitter.split_documents(documents)
+        return _merge_small_chunks(chunks)
+    
+    async def create_document(
+        self,
+        session_id: UUID,
+        filename: str,
+        mime_type: str,
+        file_size: int
+    ) -> UUID:
+        """
+        Register an upload so its status can be tracked while it is processed.
+        
+        Args:
+            session_id: Session UUID for isolation
+            filename: Original filename
+            mime_type: MIME type of the file
+            file_size: File size in bytes
+            
+        Returns:
+            Document UUID (status='pending')
+        """
+        document = await self.doc_repo.create_document(
+            session_id=session_id,
+            filename=filename,
+            mime_type=mime_type,
+            file_size=file_size
         )
+        return document.id
     
     async def ingest_document(
         self,
-        file_content: bytes,
+        file_path: str,
+        document_id: UUID,
         filename: str,
         session_id: UUID,
         mime_type: str
     ) -> UUID:
         """
-        Ingest a document into the vector store.
+        Ingest a previously registered document into the vector store.
         
         Processing pipeline:
-        1. Create document record (status='pending')
-        2. Parse file based on MIME type
-        3. Chunk text with overlap
-        4. Add session_id to every chunk's metadata (CRITICAL)
-        5. Generate embeddings and store in pgvector
-        6. Update status to 'indexed' or 'failed'
+        1. Parse file based on MIME type
+        2. Chunk text with overlap
+        3. Add session/document metadata to every chunk
+        4. Generate embeddings
+        5. In one transaction: set status 'indexed' and COPY into pgvector
+           (on any error, roll back and set 'failed' instead)
+        
+        Steps 2-5 run as a pipeline (see _index_documents).
         
         Args:
-            file_content: Binary file content
+            file_path: Path to the uploaded file on disk (caller cleans it up)
+            document_id: Document UUID from create_document
             filename: Original filename
             session_id: Session UUID for isolation
             mime_type: MIME type of the file
@@ -75,71 +208,139 @@ class DocumentService:
             
         Raises:
             ValueError: For unsupported file types
+            Exception: Whatever parsing, embedding or storing raised (the
+                document is marked 'failed' first)
         """
-        document = None
-        temp_file_path = None
-        
         try:
-            # 1. Create document record
-            document = await self.doc_repo.create_document(
-                session_id=session_id,
-                filename=filename,
-                mime_type=mime_type,
-                file_size=len(file_content)
-            )
-            
-            logger.info(f"Processing document {document.id}: {filename}")
-            
-            # 2. Update status to processing
-            await self.doc_repo.update_status(document.id, "processing")
+            logger.info(f"Processing document {document_id}: {filename}")
             
-            # 3. Write to temporary file (loaders need file paths)
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-            
-            # 4. Load document based on type
+            # 1. Parse document based on type, from one read of the spooled upload
             if mime_type == "application/pdf":
-                loader = PyPDFLoader(temp_file_path)
+                parse = _parse_pdf
             elif mime_type in ["text/plain", "text/markdown"]:
-                loader = TextLoader(temp_file_path)
+                parse = _parse_text
             else:
                 raise ValueError(f"Unsupported file type: {mime_type}")
             
-            documents = loader.load()
+            loop = asyncio.get_running_loop()
+            data = await loop.run_in_executor(_parse_executor, Path(file_path).read_bytes)
+            documents = await parse(data, filename)
             logger.info(f"Loaded {len(documents)} pages/sections from {filename}")
             
-            # 5. Chunk the documents
-            chunks = self.text_splitter.split_documents(documents)
-            logger.info(f"Split into {len(chunks)} chunks")
+            # 2-5. Chunk, tag, embed and store, as overlapping stages
+            chunk_count = await self._index_documents(documents, session_id, document_id, filename)
             
-            # 6. Add metadata to EVERY chunk (CRITICAL for session isolation)
-            for chunk in chunks:
-                chunk.metadata.update({
-                    "session_id": str(session_id),  # ⭐ CRITICAL
-                    "document_id": str(document.id),
-                    "filename": filename
-                })
+            logger.info(f"Successfully ingested {chunk_count} chunks from {filename}")
+            return document_id
             
-            # 7. Store in vector database
-            await self.vector_repo.add_documents(chunks)
-            
-            # 8. Update document status to indexed
-            await self.doc_repo.update_status(document.id, "indexed")
+        except Exception:
+            logger.exception(f"Document ingestion failed for {filename}")
+            await self.doc_repo.rollback()
+            await self.doc_repo.update_status(document_id, "failed")
+            raise
+    
+    async def _index_documents(
+        self,
+        documents: List[Document],
+        session_id: UUID,
+        document_id: UUID,
+        filename: str
+    ) -> int:
+        """
+        Split, embed and COPY chunks as concurrent stages connected by
+        bounded queues, so embedding starts before splitting has finished
+        and rows are written in COPY_FLUSH_ROWS batches:
+        
+            splitter -> EMBEDDING_CONCURRENCY embedders -> writer
+        
+        The 'indexed' status and every COPY share the session's transaction,
+        which the caller commits.
+        
+        Args:
+            documents: Parsed pages/sections
+            session_id: Session UUID for isolation
+            document_id: Document UUID
+            filename: Original filename
             
-            logger.info(f"Successfully ingested {len(chunks)} chunks from {filename}")
-            return document.id
+        Returns:
+            Number of chunks stored
             
-        except Exception as e:
-            logger.error(f"Document ingestion failed for {filename}: {e}")
-            if document:
-                await self.doc_repo.update_status(document.id, "failed")
-            raise
+        Raises:
+            Exception: The first error of a failed stage (not the TaskGroup's
+                ExceptionGroup), after cancelling the other stages
+        """
+        # Returned with search results; isolation itself uses the
+        # session_id column set by the COPY
+        base_metadata = {
+            "session_id": str(session_id),  # ⭐ CRITICAL
+            "document_id": str(document_id),
+            "filename": filename
+        }
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        embedder_count = settings.EMBEDDING_CONCURRENCY
+        chunk_batches: "asyncio.Queue[Optional[List[Document]]]" = asyncio.Queue(maxsize=embedder_count * 2)
+        embedded: "asyncio.Queue[Optional[Tuple[List[Document], List[List[float]]]]]" = asyncio.Queue(
+            maxsize=embedder_count * 2
+        )
+        
+        async def split() -> None:
+            loop = asyncio.get_running_loop()
+            pending: List[Document] = []
+            for document in documents:
+                chunks = await loop.run_in_executor(_parse_executor, self._split_documents, [document])
+                for chunk in chunks:
+                    chunk.metadata |= base_metadata
+                pending.extend(chunks)
+                while len(pending) >= batch_size:
+                    await chunk_batches.put(pending[:batch_size])
+                    pending = pending[batch_size:]
+            if pending:
+                await chunk_batches.put(pending)
+            for _ in range(embedder_count):
+                await chunk_batches.put(None)  # One stop signal per embedder
+        
+        async def embed() -> None:
+            while (batch := await chunk_batches.get()) is not None:
+                vectors = await self.vector_repo.embed_documents([c.page_content for c in batch])
+                await embedded.put((batch, vectors))
+            await embedded.put(None)
+        
+        async def write() -> int:
+            stored = 0
+            chunks: List[Document] = []
+            vectors: List[List[float]] = []
+            running = embedder_count
+            conn = None
             
-        finally:
-            # Clean up temporary file
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                except Exception as e:
-                    logger.warning(f"Failed to delete temp file: {e}")
+            while running:
+                item = await embedded.get()
+                if item is None:
+                    running -= 1
+                else:
+                    chunks.extend(item[0])
+                    vectors.extend(item[1])
+                if len(chunks) < settings.COPY_FLUSH_ROWS and running:
+                    continue
+                
+                if conn is None:
+                    # Opened at the first flush, not while the first batches
+                    # embed; the UPDATE starts the transaction the COPYs join
+                    await self.doc_repo.update_status(document_id, "indexed")
+                    conn = await self.doc_repo.connection()
+                if chunks:
+                    await self.vector_repo.copy_documents(chunks, vectors, session_id, document_id, conn=conn)
+                    stored += len(chunks)
+                    chunks, vectors = [], []
+            return stored
+        
+        # Any failing stage cancels the others
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(split())
+                for _ in range(embedder_count):
+                    group.create_task(embed())
+                writer = group.create_task(write())
+        except ExceptionGroup as e:
+            # Surface the actual cause (OpenAI, DB, pypdf error) to the caller
+            raise e.exceptions[0] from None
+        return writer.result()
@@ -0,0 +1,97 @@
+"""ARQ worker for document ingestion.
+
+Parsing and embedding uploads is moved out of the API process so it
+neither competes with request handling nor gets lost on restart.
+
+Run with:
+    arq app.worker.WorkerSettings
+"""
+import asyncio
+import logging
+import os
+from uuid import UUID
+import uvloop
+from arq.connections import RedisSettings
+from app.config import settings
+from app.database import session_scope
+from app.http_client import create_openai_http_client
+from app.repositories.vector_store import VectorStoreRepository
+from app.repositories.document_repository import DocumentRepository
+from app.services.document_service import DocumentService
+
+logger = logging.getLogger(__name__)
+
+# The arq CLI imports this module before creating its event loop
+uvloop.install()
+
+
+async def startup(ctx: dict) -> None:
+    """Create the per-process vector repository shared by all jobs."""
+    ctx["openai_http"] = create_openai_http_client()
+    ctx["vector_repo"] = VectorStoreRepository(ctx["openai_http"])
+
+
+async def shutdown(ctx: dict) -> None:
+    """Release the vector repository's background resources."""
+    await ctx["vector_repo"].close()
+    await ctx["openai_http"].aclose()
+
+
+async def ingest_document(
+    ctx: dict,
+    file_path: str,
+    document_id: UUID,
+    filename: str,
+    session_id: UUID,
+    mime_type: str
+) -> None:
+    """
+    Ingest an uploaded file and delete it afterwards.
+    
+    Failures are recorded on the document ('failed' status) rather than
+    raised, since re-running a partially indexed upload isn't safe.
+    
+    Args:
+        ctx: ARQ job context
+        file_path: Path of the spooled upload
+        document_id: Document UUID created by the upload route
+        filename: Original filename
+        session_id: Session UUID for isolation
+        mime_type: MIME type of the file
+    """
+    try:
+        async with session_scope() as db:
+            doc_service = DocumentService(ctx["vector_repo"], DocumentRepository(db))
+            try:
+                await doc_service.ingest_document(
+                    file_path=file_path,
+                    document_id=document_id,
+                    filename=filename,
+                    session_id=session_id,
+                    mime_type=mime_type
+                )
+            except Exception:
+                pass  # Logged and marked 'failed' by the service; commit that
+    except asyncio.CancelledError:
+        # job_timeout hit (or worker shutdown); don't leave it 'pending'
+        async with session_scope() as db:
+            await DocumentRepository(db).update_status(document_id, "failed")
+        raise
+    finally:
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to delete uploaded file: {e}")
+
+
+class WorkerSettings:
+    """ARQ worker configuration."""
+    functions = [ingest_document]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(settings.REDIS_URL)
+    max_jobs = settings.MAX_CONCURRENT_UPLOADS  # Bounds memory/disk pressure
+    max_tries = 1  # See ingest_document: jobs are not retried
+    job_timeout = settings.INGEST_JOB_TIMEOUT
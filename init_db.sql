@@ -39,7 +39,9 @@ CREATE TABLE IF NOT EXISTS embeddings (
 );
 
 -- Critical indexes for performance
-CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages(session_id, created_at);
+-- History lookups: WHERE session_id = ? ORDER BY created_at DESC LIMIT n is a bounded index descent.
+-- Also created at startup (VectorStoreRepository.ensure_schema) for databases initialized earlier.
+CREATE INDEX IF NOT EXISTS idx_chat_messages_session_created ON chat_messages(session_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_documents_session ON documents(session_id);
 CREATE INDEX IF NOT EXISTS idx_embeddings_document ON embeddings(document_id);
 
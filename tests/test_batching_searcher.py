@@ -0,0 +1,116 @@
+"""Unit tests for BatchingSearcher, against a fake repository."""
+import asyncio
+import uuid
+import pytest
+from langchain.schema import Document
+from app.repositories.batching_searcher import BatchingSearcher
+
+
+class FakeRepo:
+    """Stands in for VectorStoreRepository, recording the batches it gets."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.embed_calls = []
+        self.search_calls = []
+
+    async def embed_queries(self, queries):
+        self.embed_calls.append(queries)
+        if self.error is not None:
+            raise self.error
+        return [[float(i)] for i in range(len(queries))]
+
+    async def similarity_search_batch(self, embeddings, session_ids, k):
+        self.search_calls.append((embeddings, session_ids, k))
+        return [
+            [Document(page_content=f"{session_id}-{i}") for i in range(k)]
+            for session_id in session_ids
+        ]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_batch():
+    """Searches within the window cost one embedding call and one query."""
+    repo = FakeRepo()
+    batcher = BatchingSearcher(repo, window=0.05, max_batch_size=10)
+    sessions = [uuid.uuid4() for _ in range(3)]
+
+    results = await asyncio.gather(*[
+        batcher.search(f"question {i}", session_id, k=2)
+        for i, session_id in enumerate(sessions)
+    ])
+    await batcher.close()
+
+    assert repo.embed_calls == [["question 0", "question 1", "question 2"]]
+    assert len(repo.search_calls) == 1
+    assert repo.search_calls[0][1] == sessions
+    for session_id, documents in zip(sessions, results):
+        assert [doc.page_content for doc in documents] == [f"{session_id}-0", f"{session_id}-1"]
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size_splits_batches():
+    """A full batch is flushed without waiting for the window."""
+    repo = FakeRepo()
+    batcher = BatchingSearcher(repo, window=10, max_batch_size=2)
+
+    await asyncio.wait_for(
+        asyncio.gather(*[batcher.search(f"q{i}", uuid.uuid4()) for i in range(4)]),
+        timeout=1
+    )
+    await batcher.close()
+
+    assert [len(queries) for queries in repo.embed_calls] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_each_caller_gets_its_own_k():
+    """The batch searches with the largest k and slices per caller."""
+    repo = FakeRepo()
+    batcher = BatchingSearcher(repo, window=0.05, max_batch_size=10)
+
+    small, large = await asyncio.gather(
+        batcher.search("small", uuid.uuid4(), k=1),
+        batcher.search("large", uuid.uuid4(), k=3)
+    )
+    await batcher.close()
+
+    assert repo.search_calls[0][2] == 3
+    assert len(small) == 1
+    assert len(large) == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller():
+    """A failing batch raises its error in every search of the batch."""
+    error = RuntimeError("embedding API down")
+    batcher = BatchingSearcher(FakeRepo(error=error), window=0.05, max_batch_size=10)
+
+    results = await asyncio.gather(
+        batcher.search("a", uuid.uuid4()),
+        batcher.search("b", uuid.uuid4()),
+        return_exceptions=True
+    )
+    await batcher.close()
+
+    assert results == [error, error]
+
+
+@pytest.mark.asyncio
+async def test_close_fails_unflushed_searches():
+    """Searches still being collected when the batcher closes don't hang."""
+    repo = FakeRepo()
+    batcher = BatchingSearcher(repo, window=10, max_batch_size=10)
+
+    searches = [asyncio.create_task(batcher.search(f"q{i}", uuid.uuid4())) for i in range(3)]
+    await asyncio.sleep(0.01)  # Let the collector pick them up
+    await batcher.close()
+
+    for search in searches:
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(search, timeout=1)
+    assert repo.embed_calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""Unit tests for chunk splitting and merging in the ingestion service."""
+import os
+import pytest
+from langchain.schema import Document
+
+# Settings() requires DATABASE_URL; nothing here connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+
+from app.config import settings
+from app.services.document_service import DocumentService, _merge_small_chunks
+
+
+def _page(text: str, page: int) -> Document:
+    """A parsed PDF page."""
+    return Document(page_content=text, metadata={"source": "doc.pdf", "page": page})
+
+
+@pytest.fixture
+def service():
+    """DocumentService for the pure splitting helpers (no repositories needed)."""
+    return DocumentService(vector_repo=None, doc_repo=None)
+
+
+def test_small_chunk_merges_into_same_page_neighbour():
+    """A fragment below MIN_CHUNK_SIZE is appended to the previous chunk of its page."""
+    long_text = "a" * settings.MIN_CHUNK_SIZE
+    short_text = "b" * (settings.MIN_CHUNK_SIZE - 1)
+
+    merged = _merge_small_chunks([_page(long_text, 0), _page(short_text, 0)])
+
+    assert len(merged) == 1
+    assert merged[0].page_content == long_text + "\n" + short_text
+
+
+def test_leading_small_chunk_absorbs_the_next():
+    """A short first chunk takes in the following chunk of the same page."""
+    short_text = "a" * (settings.MIN_CHUNK_SIZE - 1)
+    long_text = "b" * settings.MIN_CHUNK_SIZE
+
+    merged = _merge_small_chunks([_page(short_text, 0), _page(long_text, 0)])
+
+    assert [chunk.page_content for chunk in merged] == [short_text + "\n" + long_text]
+
+
+def test_small_chunks_are_not_merged_across_pages():
+    """Chunks of different pages keep their own metadata, however short."""
+    chunks = [_page("a" * settings.MIN_CHUNK_SIZE, 0), _page("b", 1), _page("c", 2)]
+
+    merged = _merge_small_chunks(chunks)
+
+    assert [chunk.metadata["page"] for chunk in merged] == [0, 1, 2]
+
+
+def test_chunks_at_min_size_are_kept_apart():
+    """Chunks of at least MIN_CHUNK_SIZE are left as they are."""
+    chunks = [_page("a" * settings.MIN_CHUNK_SIZE, 0), _page("b" * settings.MIN_CHUNK_SIZE, 0)]
+
+    assert len(_merge_small_chunks(chunks)) == 2
+
+
+def test_short_document_skips_the_splitter_and_drops_blank_pages(service):
+    """Documents that fit in one chunk keep one chunk per non-blank page."""
+    documents = [_page("First page.", 0), _page("  \n\t", 1), _page("", 2), _page("Last page.", 3)]
+
+    chunks = service._split_documents(documents)
+
+    assert chunks == [documents[0], documents[3]]
+
+
+def test_long_document_is_split_within_chunk_size(service):
+    """Longer documents are split into CHUNK_SIZE chunks that keep their page metadata."""
+    text = " ".join(f"Sentence number {i} of the page." for i in range(500))
+
+    chunks = service._split_documents([_page(text, 7)])
+
+    assert len(chunks) > 1
+    # A trailing fragment under MIN_CHUNK_SIZE may have been merged into its neighbour
+    assert all(len(chunk.page_content) <= settings.CHUNK_SIZE + settings.MIN_CHUNK_SIZE for chunk in chunks)
+    assert all(chunk.metadata == {"source": "doc.pdf", "page": 7} for chunk in chunks)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""Batched vector search against a real database.
+
+Loads known vectors for two sessions with COPY and checks that
+similarity_search_batch returns each session's nearest chunks, in order,
+and nothing from the other session.
+
+Runs against the configured DATABASE_URL (e.g. `docker-compose up db`).
+Skipped if DATABASE_URL isn't set or the database isn't reachable.
+"""
+import os
+import uuid
+import httpx
+import pytest
+import pytest_asyncio
+from langchain.schema import Document
+from sqlalchemy import text
+
+# Settings() requires DATABASE_URL, so check before anything imports app.config
+if not os.getenv("DATABASE_URL") and not os.path.exists(".env"):
+    pytest.skip("DATABASE_URL not configured", allow_module_level=True)
+
+from app.config import settings
+from app.database import engine
+from app.repositories.vector_store import VectorStoreRepository
+
+
+def _unit_vector(axis: int) -> list:
+    """Embedding pointing along one axis, so nearest neighbours are known."""
+    vector = [0.0] * settings.EMBEDDING_DIMENSION
+    vector[axis] = 1.0
+    return vector
+
+
+# Both sessions hold a chunk on axis 0; only the session filter tells them apart
+CHUNKS = {
+    "a": [("a-axis0", 0), ("a-axis1", 1)],
+    "b": [("b-axis0", 0), ("b-axis2", 2)]
+}
+
+
+@pytest_asyncio.fixture(scope="module")
+async def vector_repo():
+    """Repository with its schema in place; the engine is disposed afterwards."""
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (OSError, ConnectionError):
+        await engine.dispose()
+        pytest.skip("Database not reachable")
+
+    async with httpx.AsyncClient() as http_client:
+        repo = VectorStoreRepository(http_client)
+        await repo.ensure_schema()
+        yield repo
+        await repo.close()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="module")
+async def sessions(vector_repo):
+    """Two sessions, each with one document of known chunks; deleted afterwards."""
+    session_ids = {name: uuid.uuid4() for name in CHUNKS}
+
+    async with engine.begin() as conn:
+        for name, session_id in session_ids.items():
+            document_id = uuid.uuid4()
+            await conn.execute(
+                text("INSERT INTO sessions (id) VALUES (:id)"),
+                {"id": session_id}
+            )
+            await conn.execute(
+                text(
+                    "INSERT INTO documents (id, session_id, filename, status) "
+                    "VALUES (:id, :session_id, :filename, 'indexed')"
+                ),
+                {"id": document_id, "session_id": session_id, "filename": f"{name}.txt"}
+            )
+            await vector_repo.copy_documents(
+                [Document(page_content=content, metadata={}) for content, _ in CHUNKS[name]],
+                [_unit_vector(axis) for _, axis in CHUNKS[name]],
+                session_id,
+                document_id,
+                conn=conn
+            )
+
+    yield session_ids
+
+    # Cascades to documents, document_chunks and their embeddings
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM sessions WHERE id = ANY(:ids)"),
+            {"ids": list(session_ids.values())}
+        )
+
+
+@pytest.mark.asyncio(scope="module")
+async def test_similarity_search_batch(vector_repo, sessions):
+    """One round-trip answers queries for both sessions, each filtered to its own chunks."""
+    results = await vector_repo.similarity_search_batch(
+        [_unit_vector(0), _unit_vector(0), _unit_vector(2)],
+        [sessions["a"], sessions["b"], sessions["b"]],
+        k=2
+    )
+
+    contents = [[doc.page_content for doc in docs] for docs in results]
+    assert contents[0] == ["a-axis0", "a-axis1"]
+    assert contents[1] == ["b-axis0", "b-axis2"]
+    assert contents[2] == ["b-axis2", "b-axis0"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])